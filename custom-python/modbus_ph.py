@@ -2,6 +2,10 @@ import minimalmodbus
 import serial
 import struct
 
+# Precompiled layouts for decoding a float from two registers, low word first
+_WORDS = struct.Struct('<HH')
+_FLOAT = struct.Struct('<f')
+
 # Create an instrument object
 instrument = minimalmodbus.Instrument('/dev/ttyUSB0', slaveaddress=1, debug=False)
 instrument.serial.baudrate = 19200
@@ -9,6 +13,13 @@ instrument.serial.bytesize = 8
 instrument.serial.parity = serial.PARITY_NONE
 instrument.serial.stopbits = 2
 instrument.serial.timeout = 1
+
+# Have the USB-serial driver (e.g. FTDI) pass on received bytes immediately
+# instead of holding them for its default 16 ms latency timer
+try:
+    instrument.serial.set_low_latency_mode(True)
+except (AttributeError, IOError, ValueError, NotImplementedError):
+    pass  # Not supported by this platform or driver
 instrument.mode = minimalmodbus.MODE_RTU
 instrument.clear_buffers_before_each_transaction = True
 
@@ -18,17 +29,13 @@ ph_values = instrument.read_registers(2089, 10, functioncode=3)
 # Read 10 registers starting from 2410
 temp_values = instrument.read_registers(2409, 10, functioncode=3)
 
-# Combine the register values to form 32-bit integers
-ph_int = (ph_values[3] << 16) | ph_values[2]
-temp_int = (temp_values[3] << 16) | temp_values[2]
-
-# Convert the 32-bit integers to bytes
-ph_bytes = ph_int.to_bytes(4, 'little')
-temp_bytes = temp_int.to_bytes(4, 'little')
+# Pack each register pair into 4 bytes, low word first
+ph_bytes = _WORDS.pack(*ph_values[2:4])
+temp_bytes = _WORDS.pack(*temp_values[2:4])
 
 # Interpret the bytes as 32-bit floats
-pH = struct.unpack('f', ph_bytes)[0]
-temperature = struct.unpack('f', temp_bytes)[0]
+pH = _FLOAT.unpack(ph_bytes)[0]
+temperature = _FLOAT.unpack(temp_bytes)[0]
 
 
 # # Store measurements
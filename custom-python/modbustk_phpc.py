@@ -1,36 +1,85 @@
+import struct
+import time
+
 import modbus_tk.defines as cst
 import modbus_tk.modbus_rtu as modbus_rtu
 import serial
+from modbus_tk.exceptions import ModbusError
+from modbus_tk.exceptions import ModbusInvalidResponseError
+
+# Seconds between polls
+POLL_INTERVAL = 10
+
+# Only report a value when it has moved more than this since it was last reported
+PH_DEADBAND = 0.01
+TEMP_DEADBAND = 0.1
+
+# Precompiled layouts for decoding a float from two registers, low word first
+_WORDS = struct.Struct('<HH')
+_FLOAT = struct.Struct('<f')
+
+port = serial.Serial(port='/dev/ttyUSB1', baudrate=19200, bytesize=8, parity='N', stopbits=2, xonxoff=0)
+
+# Have the USB-serial driver (e.g. FTDI) pass on received bytes immediately
+# instead of holding them for its default 16 ms latency timer
+try:
+    port.set_low_latency_mode(True)
+except (AttributeError, IOError, ValueError, NotImplementedError):
+    pass  # Not supported by this platform or driver
 
 # Create a Modbus RTU master
-master = modbus_rtu.RtuMaster(
-    serial.Serial(port='/dev/ttyUSB1', baudrate=19200, bytesize=8, parity='N', stopbits=2, xonxoff=0)
-)
+master = modbus_rtu.RtuMaster(port)
 master.set_timeout(1.0)
 master.set_verbose(True)
 
-try:
-    # Connect to the Modbus RTU master
-    master.open()
 
+def read_measurements():
+    """Read pH and temperature over the already open connection"""
     # Read 10 registers starting from 2090
     ph_values = master.execute(1, cst.READ_HOLDING_REGISTERS, 2089, 10)
 
     # Read 10 registers starting from 2410
     temp_values = master.execute(1, cst.READ_HOLDING_REGISTERS, 2409, 10)
 
-    # Interpret the register values as measurements
-    pH = ph_values[2]
-    temperature = temp_values[2]
+    # Interpret registers 2 and 3 of each block as a 32-bit float
+    pH = _FLOAT.unpack(_WORDS.pack(*ph_values[2:4]))[0]
+    temperature = _FLOAT.unpack(_WORDS.pack(*temp_values[2:4]))[0]
+    return pH, temperature
+
+
+def changed(new, old, deadband):
+    """Whether a value should be reported, given the last reported value"""
+    return old is None or abs(new - old) > deadband
+
+
+# Last reported values
+last_pH = None
+last_temp = None
+
+try:
+    # Connect to the Modbus RTU master once and keep the port open between polls
+    master.open()
+
+    while True:
+        try:
+            pH, temperature = read_measurements()
+        except (ModbusError, ModbusInvalidResponseError) as err:
+            print(f"Read failed: {err}")
+        else:
+            if changed(pH, last_pH, PH_DEADBAND):
+                last_pH = pH
+                # self.store_measurement(channel=0, measurement=pH)
+                print(f"pH: {pH}")
 
-    # # Store measurements
-    # self.store_measurement(channel=0, measurement=pH)
-    # self.store_measurement(channel=1, measurement=temperature)
+            if changed(temperature, last_temp, TEMP_DEADBAND):
+                last_temp = temperature
+                # self.store_measurement(channel=1, measurement=temperature)
+                print(f"Temperature: {temperature}")
 
-    # Print the measurements
-    print(f"pH: {pH}")
-    print(f"Temperature: {temperature}")
+        time.sleep(POLL_INTERVAL)
 
+except KeyboardInterrupt:
+    pass
 
 finally:
     # Close the connection
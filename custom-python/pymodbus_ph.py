@@ -1,32 +1,83 @@
-from pymodbus.client.sync import ModbusSerialClient
+import atexit
 import struct
+import time
+
+from pymodbus.client.sync import ModbusSerialClient
+from pymodbus.exceptions import ConnectionException
+from pymodbus.exceptions import ModbusException
+from pymodbus.exceptions import ModbusIOException
+
+# Seconds between polls
+POLL_INTERVAL = 10
+
+# Precompiled layouts for decoding a float from two registers, low word first
+_WORDS = struct.Struct('<HH')
+_FLOAT = struct.Struct('<f')
+
+_CLIENT = None
+
+
+def get_client():
+    """Return a connected Modbus client, creating it on first use"""
+    global _CLIENT
+    if _CLIENT is None:
+        # Create a Modbus client object
+        _CLIENT = ModbusSerialClient(method='rtu', port='COM7', baudrate=19200, bytesize=8, parity='N', stopbits=2, timeout=1)
+        atexit.register(_CLIENT.close)
+
+    # Connect to the Modbus device (no-op if the port is already open)
+    if not _CLIENT.is_socket_open():
+        _CLIENT.connect()
+    return _CLIENT
+
+
+def read_holding_registers(address, count):
+    """Read holding registers, reconnecting once if the link was dropped"""
+    try:
+        result = get_client().read_holding_registers(address=address, count=count, unit=1)
+    except ConnectionException:
+        result = None
+    # A device exception response (e.g. illegal address) is not retried,
+    # only a dropped link or a missing response
+    if result is None or isinstance(result, ModbusIOException):
+        _CLIENT.close()
+        result = get_client().read_holding_registers(address=address, count=count, unit=1)
+    if result.isError():
+        raise ModbusException(str(result))
+    return result
 
-# Create a Modbus client object
-client = ModbusSerialClient(method='rtu', port='COM7', baudrate=19200, bytesize=8, parity='N', stopbits=2, timeout=1)
 
-# Connect to the Modbus device
-client.connect()
+def read_measurements():
+    """Read pH and temperature over the already open connection"""
+    # Read 10 registers starting from 2090 (0-based address 2089, as in
+    # modbus_ph.py and modbustk_phpc.py)
+    ph_values = read_holding_registers(2089, 10)
 
-# Read 10 registers starting from address 2090
-ph_values = client.read_holding_registers(address=2090, count=10, unit=1)
+    # Read 10 registers starting from 2410 (0-based address 2409)
+    temp_values = read_holding_registers(2409, 10)
 
-# Read 10 registers starting from address 2410
-temp_values = client.read_holding_registers(address=2410, count=10, unit=1)
+    # Pack each register pair into 4 bytes, low word first, so the float is
+    # built from both full words
+    pH = _FLOAT.unpack(_WORDS.pack(*ph_values.registers[2:4]))[0]
+    temperature = _FLOAT.unpack(_WORDS.pack(*temp_values.registers[2:4]))[0]
+    return pH, temperature
 
-# Close the Modbus connection
-client.close()
 
-# Convert the register values to bytestrings
-ph_bytes = bytearray(ph_values.registers[2:4])
-temp_bytes = bytearray(temp_values.registers[2:4])
+try:
+    while True:
+        try:
+            pH, temperature = read_measurements()
+        except ModbusException as err:
+            print(f"Read failed: {err}")
+        else:
+            # self.store_measurement(channel=0, measurement=pH)
+            # self.store_measurement(channel=1, measurement=temperature)
 
-# Interpret the bytestrings as measurements
-pH = struct.unpack('f', ph_bytes)[0]
-temperature = struct.unpack('f', temp_bytes)[0]
+            # Print the measurements
+            print(f"pH: {pH}")
+            print(f"Temperature: {temperature}")
 
-# self.store_measurement(channel=0, measurement=pH)
-# self.store_measurement(channel=1, measurement=temperature)
+        time.sleep(POLL_INTERVAL)
 
-# Print the measurements
-print(f"pH: {pH}")
-print(f"Temperature: {temperature}")
+except KeyboardInterrupt:
+    pass
@@ -23,7 +23,6 @@
 #
 import threading
 import time
-import timeit
 from flask_babel import lazy_gettext
 from mycodo.databases.models import Conversion
 from mycodo.databases.models import CustomController
@@ -44,7 +43,9 @@ FUNCTION_INFORMATION = {
     'message': 'This controller is a CoolBot cone, which will provide the functionality of a CoolBot. '
                'Requirements: Output to power a heater attached to the AC temperature sensor '
                '(disconnected from the AC airway), a temperature sensor to measure the room, '
-               'and a temperature sensor attached to the condenser to detect freezing.',
+               'and a temperature sensor attached to the condenser to detect freezing. '
+               'Measurement units are read when the Function is activated, so reactivate it '
+               'after changing the unit conversion of either temperature measurement.',
 
     'options_enabled': [
         'custom_options'
@@ -178,7 +179,8 @@ class CustomModule(AbstractFunction):
         super(CustomModule, self).__init__(function, testing=testing, name=__name__)
 
         self.is_setup = False
-        self.timer_loop = time.time()
+        self.timer_loop = time.monotonic_ns()
+        self.period_ns = None
         self.control = DaemonControl()
 
         # Initialize custom options
@@ -187,9 +189,11 @@ class CustomModule(AbstractFunction):
         self.in_temp_condenser_device_id = None
         self.in_temp_condenser_measurement_id = None
         self.in_temp_condenser_max_age = None
+        self.in_temp_condenser_unit = None
         self.in_temp_room_device_id = None
         self.in_temp_room_measurement_id = None
         self.in_temp_room_max_age = None
+        self.in_temp_room_unit = None
         self.out_ac_heater_device_id = None
         self.out_ac_heater_measurement_id = None
         self.out_ac_heater_channel_id = None
@@ -201,6 +205,7 @@ class CustomModule(AbstractFunction):
         self.temp_direction = None
         self.temp_upper = None
         self.temp_lower = None
+        self.measurement_missing = False
 
         custom_function = db_retrieve_table_daemon(
             CustomController, unique_id=self.unique_id)
@@ -215,48 +220,84 @@ class CustomModule(AbstractFunction):
         self.temp_lower = self.setpoint_temperature - self.temperature_hysteresis
         self.output_ac_heater_channel = self.get_output_channel_from_channel_id(
             self.out_ac_heater_channel_id)
-        self.timer_loop = time.time() + self.start_offset
+        if self.output_ac_heater_channel is None:
+            self.logger.error(
+                "Could not find the heater output channel. Select a valid output and reactivate the Function.")
+            return
+        self.in_temp_condenser_unit = self.get_measurement_unit(
+            self.in_temp_condenser_measurement_id)
+        self.in_temp_room_unit = self.get_measurement_unit(
+            self.in_temp_room_measurement_id)
+        if self.in_temp_condenser_unit is None or self.in_temp_room_unit is None:
+            self.logger.error(
+                "Could not find the condenser or room temperature measurement. "
+                "Select valid measurements and reactivate the Function. Turning off AC")
+            self.control.output_off(self.out_ac_heater_device_id, output_channel=self.output_ac_heater_channel)
+            return
+        self.period_ns = int(self.period * 1_000_000_000)
+        self.timer_loop = time.monotonic_ns() + int(self.start_offset * 1_000_000_000)
         self.is_setup = True
 
     def loop(self):
-        if self.timer_loop > time.time():
+        if not self.is_setup:
+            return
+
+        now = time.monotonic_ns()
+        if now < self.timer_loop:
             return
 
-        while self.timer_loop < time.time():
-            self.timer_loop += self.period
+        # Step to the next period boundary in one go, skipping any missed periods
+        self.timer_loop += ((now - self.timer_loop) // self.period_ns + 1) * self.period_ns
 
         temperature_condenser = self.get_ac_condenser_temperature()
         temperature_room = self.get_room_temperature()
 
-        if not temperature_condenser or not temperature_room:
-            self.logger.error("Could not get condenser or room temperature. Turning off AC")
-            self.control.output_off(self.out_ac_heater_device_id, output_channel=self.output_ac_heater_channel)
+        if temperature_condenser is None or temperature_room is None:
+            if not self.measurement_missing:
+                # Send the stop once when the episode starts
+                self.logger.error("Could not get condenser or room temperature. Turning off AC")
+                self.control.output_off(self.out_ac_heater_device_id, output_channel=self.output_ac_heater_channel)
+                self.measurement_missing = True
+            else:
+                self.logger.error("Condenser or room temperature still missing")
             return
+        self.measurement_missing = False
 
-        self.logger.debug(f"Temperatures: Room = {temperature_room} C, Condenser = {temperature_condenser} C")
+        self.logger.debug(
+            "Temperatures: Room = %s C, Condenser = %s C", temperature_room, temperature_condenser)
 
         if temperature_condenser <= self.temperature_freeze:
             # condenser too cold, stop cooling
             self.logger.debug(
-                f"{temperature_condenser} C < {self.temperature_freeze} C (Freezing): "
-                f"Turning heater output ({self.out_ac_heater_device_id}) off")
-            self.control.output_off(self.out_ac_heater_device_id, output_channel=self.output_ac_heater_channel
-            )
+                "%s C < %s C (Freezing): Turning heater output (%s) off",
+                temperature_condenser, self.temperature_freeze, self.out_ac_heater_device_id)
+            self.control.output_off(self.out_ac_heater_device_id, output_channel=self.output_ac_heater_channel)
         elif temperature_room > self.temp_upper and (not self.temp_direction or self.temp_direction == "heat"):
             # Temperature is too high, start cooling
             self.temp_direction = "cool"
             self.logger.debug(
-                f"{temperature_room} C > {self.temp_upper} C: "
-                f"Turning heater output ({self.out_ac_heater_device_id}) on")
+                "%s C > %s C: Turning heater output (%s) on",
+                temperature_room, self.temp_upper, self.out_ac_heater_device_id)
             self.control.output_on(self.out_ac_heater_device_id, output_channel=self.output_ac_heater_channel)
         elif temperature_room < self.temp_lower and (not self.temp_direction or self.temp_direction == "cool"):
             # Temperature is too low, stop cooling
             self.temp_direction = "heat"
             self.logger.debug(
-                f"{temperature_room} C < {self.temp_lower} C: "
-                f"Turning heater output ({self.out_ac_heater_device_id}) off")
-            self.control.output_off(
-              self.out_ac_heater_device_id, output_channel=self.output_ac_heater_channel)
+                "%s C < %s C: Turning heater output (%s) off",
+                temperature_room, self.temp_lower, self.out_ac_heater_device_id)
+            self.control.output_off(self.out_ac_heater_device_id, output_channel=self.output_ac_heater_channel)
+
+    @staticmethod
+    def get_measurement_unit(measurement_id):
+        """Resolve the stored unit of a measurement, including any conversion"""
+        device_measurement = get_measurement(measurement_id)
+        if device_measurement is None:
+            return None
+        conversion = db_retrieve_table_daemon(
+            Conversion, unique_id=device_measurement.conversion_id)
+        channel, unit, measurement = return_measurement_info(
+            device_measurement, conversion)
+        return unit
 
     def get_ac_condenser_temperature(self):
         """Get condenser temperature"""
@@ -267,21 +308,16 @@ class CustomModule(AbstractFunction):
 
         if last_measurement:
             self.logger.debug(
-                "Most recent timestamp and measurement for "
-                f"in_temp_condenser: {last_measurement[0]}, {last_measurement[1]}")
-            device_measurement = get_measurement(
-                self.in_temp_condenser_measurement_id)
-            conversion = db_retrieve_table_daemon(
-                Conversion, unique_id=device_measurement.conversion_id)
-            channel, unit, measurement = return_measurement_info(
-                device_measurement, conversion)
-            temp_c = convert_from_x_to_y_unit(unit, 'C', last_measurement[1])
+                "Most recent timestamp and measurement for in_temp_condenser: %s, %s",
+                last_measurement[0], last_measurement[1])
+            temp_c = convert_from_x_to_y_unit(
+                self.in_temp_condenser_unit, 'C', last_measurement[1])
             return temp_c
         else:
             self.logger.debug(
                 "Could not find a measurement in the database for in_temp_condenser "
-                f"device ID {self.in_temp_condenser_device_id} and "
-                f"measurement ID {self.in_temp_condenser_measurement_id}")
+                "device ID %s and measurement ID %s",
+                self.in_temp_condenser_device_id, self.in_temp_condenser_measurement_id)
 
     def get_room_temperature(self):
         """Get condenser temperature"""
@@ -292,21 +328,16 @@ class CustomModule(AbstractFunction):
 
         if last_measurement:
             self.logger.debug(
-                "Most recent timestamp and measurement for "
-                f"in_temp_room: {last_measurement[0]}, {last_measurement[1]}")
-            device_measurement = get_measurement(
-                self.in_temp_room_measurement_id)
-            conversion = db_retrieve_table_daemon(
-                Conversion, unique_id=device_measurement.conversion_id)
-            channel, unit, measurement = return_measurement_info(
-                device_measurement, conversion)
-            temp_c = convert_from_x_to_y_unit(unit, 'C', last_measurement[1])
+                "Most recent timestamp and measurement for in_temp_room: %s, %s",
+                last_measurement[0], last_measurement[1])
+            temp_c = convert_from_x_to_y_unit(
+                self.in_temp_room_unit, 'C', last_measurement[1])
             return temp_c
         else:
             self.logger.debug(
                 "Could not find a measurement in the database for in_temp_room "
-                f"device ID {self.in_temp_room_device_id} and "
-                f"measurement ID {self.in_temp_room_measurement_id}")
+                "device ID %s and measurement ID %s",
+                self.in_temp_room_device_id, self.in_temp_room_measurement_id)
 
     def stop_function(self):
         self.logger.debug(f"Turning heater output ({self.out_ac_heater_device_id}) off")
@@ -399,7 +399,8 @@ class InputModule(AbstractInput):
             if self.sensor.data.temperature == 34.54:
                 self.logger.debug("soft_reset() executed, second measure attempt yielded 34.54 C")
             else:
-                self.logger.debug("soft_reset() executed, normal temperature measured: {} C".format(self.sensor.data.temperature))
+                self.logger.debug(
+                    "soft_reset() executed, normal temperature measured: %s C", self.sensor.data.temperature)
 
         if self.is_enabled(0):
             self.value_set(0, self.sensor.data.temperature)
@@ -416,8 +417,9 @@ class InputModule(AbstractInput):
             else:
                 self.logger.debug("Sensor heat unstable")
 
-        self.logger.debug("Temp: {t}, Hum: {h}, Press: {p}, Gas: {g}".format(
-            t=self.value_get(0), h=self.value_get(1), p=self.value_get(2), g=self.value_get(3)))
+        self.logger.debug(
+            "Temp: %s, Hum: %s, Press: %s, Gas: %s",
+            self.value_get(0), self.value_get(1), self.value_get(2), self.value_get(3))
 
         if self.is_enabled(4) and self.is_enabled(0) and self.is_enabled(1):
             self.value_set(4, calculate_dewpoint(self.value_get(0), self.value_get(1)))
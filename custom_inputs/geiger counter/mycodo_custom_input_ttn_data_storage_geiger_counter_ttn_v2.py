@@ -231,8 +231,8 @@ class InputModule(AbstractInput):
         try:
             responses = response.json()
         except ValueError:  # No data returned
-            self.logger.debug("Response Error. Response: {}. Likely there is no data to be retrieved on TTN".format(
-                response.content))
+            self.logger.debug(
+                "Response Error. Response: %s. Likely there is no data to be retrieved on TTN", response.content)
             return
 
         for i, each_resp in enumerate(response.json(), 1):
@@ -296,7 +296,7 @@ class InputModule(AbstractInput):
                             self.return_dict[channel]['value'] = meas[channel]['value']
 
             if 'value' in self.return_dict[0] and 'value' in self.return_dict[1]:
-                self.logger.debug("Adding measurements to influxdb: {}".format(self.return_dict))
+                self.logger.debug("Adding measurements to influxdb: %s", self.return_dict)
                 add_measurements_influxdb(
                     self.unique_id, self.return_dict,
                     use_same_timestamp=INPUT_INFORMATION['measurements_use_same_timestamp'])
@@ -315,7 +315,7 @@ class InputModule(AbstractInput):
                         cpm=cpm_value,
                         usv=usv_h_value)
                     contents = urllib.request.urlopen(gmcmap).read()
-                    self.logger.debug("GMCMap: {}".format(contents))
+                    self.logger.debug("GMCMap: %s", contents)
                 except Exception as e:
                     self.logger.error("Error adding data to GMC Map: {}".format(e))
 
@@ -341,8 +341,8 @@ class InputModule(AbstractInput):
                         'device_id': self.safecast_device_id,
                         'location_name': self.safecast_location_name
                     })
-                    self.logger.debug('uSv/hr measurement id: {0}'.format(measurement_usv['id']))
-                    self.logger.debug('CPM measurement id: {0}'.format(measurement_cpm['id']))
+                    self.logger.debug('uSv/hr measurement id: %s', measurement_usv['id'])
+                    self.logger.debug('CPM measurement id: %s', measurement_cpm['id'])
                 except Exception as e:
                     self.logger.error("Error adding data to Safecast: {}".format(e))
 
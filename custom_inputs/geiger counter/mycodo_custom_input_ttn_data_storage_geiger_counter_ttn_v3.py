@@ -6,7 +6,6 @@ import time
 import urllib.request
 from flask_babel import lazy_gettext
 from mycodo.config import MYCODO_DB_PATH
-from mycodo.config import SQL_DATABASE_MYCODO
 from mycodo.databases.models import Conversion
 from mycodo.databases.models import Input
 from mycodo.databases.utils import session_scope
@@ -231,10 +230,10 @@ class InputModule(AbstractInput):
         response = requests.get(endpoint, headers=headers)
         if response.status_code != 200:
             self.logger.info("response.status_code != 200: {}".format(response.reason))
-        self.logger.debug("response.content: {}".format(response.content))
+        self.logger.debug("response.content: %s", response.content)
 
         list_dicts = response.content.decode().split("\n")
-        self.logger.debug("list_dicts: {}".format(list_dicts))
+        self.logger.debug("list_dicts: %s", list_dicts)
 
         cpm_value = None
         cpm_ts = None
@@ -244,7 +243,7 @@ class InputModule(AbstractInput):
         for each_resp in list_dicts:
             if not each_resp:
                 continue
-            self.logger.debug("each_resp: {}".format(each_resp))
+            self.logger.debug("each_resp: %s", each_resp)
 
             cpm_value = None
             usv_h_value = None
@@ -253,7 +252,7 @@ class InputModule(AbstractInput):
                 resp_json = json.loads(each_resp)
             except:
                 resp_json = {}
-            self.logger.debug("resp_json: {}".format(resp_json))
+            self.logger.debug("resp_json: %s", resp_json)
 
             self.return_dict = measurements_dict.copy()
 
@@ -309,7 +308,7 @@ class InputModule(AbstractInput):
                             self.return_dict[channel]['value'] = meas[channel]['value']
 
             if 'value' in self.return_dict[0] and 'value' in self.return_dict[1]:
-                self.logger.debug("Adding measurements to influxdb: {}".format(self.return_dict))
+                self.logger.debug("Adding measurements to influxdb: %s", self.return_dict)
                 add_measurements_influxdb(
                     self.unique_id, self.return_dict,
                     use_same_timestamp=INPUT_INFORMATION['measurements_use_same_timestamp'])
@@ -338,8 +337,8 @@ class InputModule(AbstractInput):
                         'device_id': self.safecast_device_id,
                         'location_name': self.safecast_location_name
                     })
-                    self.logger.debug('uSv/hr measurement id: {0}'.format(measurement_usv['id']))
-                    self.logger.debug('CPM measurement id: {0}'.format(measurement_cpm['id']))
+                    self.logger.debug('uSv/hr measurement id: %s', measurement_usv['id'])
+                    self.logger.debug('CPM measurement id: %s', measurement_cpm['id'])
                 except Exception as e:
                     self.logger.error("Error adding data to Safecast: {}".format(e))
 
@@ -354,7 +353,7 @@ class InputModule(AbstractInput):
                     cpm=cpm_value,
                     usv=usv_h_value)
                 contents = urllib.request.urlopen(gmcmap).read()
-                self.logger.debug("GMCMap: {}".format(contents))
+                self.logger.debug("GMCMap: %s", contents)
             except Exception as e:
                 self.logger.error("Error adding data to GMC Map: {}".format(e))
 
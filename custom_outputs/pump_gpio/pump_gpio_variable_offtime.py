@@ -4,8 +4,8 @@
 #
 import copy
 import datetime
-import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from flask_babel import lazy_gettext
 
@@ -149,6 +149,8 @@ class OutputModule(AbstractOutput):
 
         self.GPIO = None
         self.currently_dispensing = False
+        self.dispense_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pump_dispense')
+        self.dispense_future = None
 
         output_channels = db_retrieve_table_daemon(
             OutputChannel).filter(OutputChannel.output_id == self.output.unique_id).all()
@@ -191,13 +193,18 @@ class OutputModule(AbstractOutput):
         self.currently_dispensing = True
         self.logger.debug("Output turned on")
         self.GPIO.output(self.options_channels['pin'][0], self.options_channels['on_state'][0])
-        timer_dispense = time.time() + total_dispense_seconds
+        start_time = time.time()
+        timer_dispense = start_time + total_dispense_seconds
         timestamp_start = datetime.datetime.utcnow()
 
         while time.time() < timer_dispense and self.currently_dispensing:
             time.sleep(0.01)
 
         self.GPIO.output(self.options_channels['pin'][0], not self.options_channels['on_state'][0])
+        if not self.currently_dispensing:
+            # Interrupted by an override or an off command, record what was actually delivered
+            total_dispense_seconds = time.time() - start_time
+            amount = self.dispensed_volume(total_dispense_seconds)
         self.currently_dispensing = False
         self.logger.debug("Output turned off")
         self.record_dispersal(amount, total_dispense_seconds, total_dispense_seconds, timestamp=timestamp_start)
@@ -206,27 +213,30 @@ class OutputModule(AbstractOutput):
         """Dispense at a specific flow rate."""
         # Calculate total disperse time and durations to cycle on/off to reach total volume
         total_dispense_seconds = amount / dispense_rate * 60
-        self.logger.debug("Total duration to run: {0:.1f} seconds".format(total_dispense_seconds))
+        self.logger.debug("Total duration to run: %.1f seconds", total_dispense_seconds)
 
         duty_cycle = dispense_rate / self.options_channels['fastest_dispense_rate_ml_min'][0]
-        self.logger.debug("Duty Cycle: {0:.1f} %".format(duty_cycle * 100))
+        self.logger.debug("Duty Cycle: %.1f %%", duty_cycle * 100)
 
         total_seconds_on = total_dispense_seconds * duty_cycle
-        self.logger.debug("Total seconds on: {0:.1f}".format(total_seconds_on))
+        self.logger.debug("Total seconds on: %.1f", total_seconds_on)
 
         total_seconds_off = total_dispense_seconds - total_seconds_on
-        self.logger.debug("Total seconds off: {0:.1f}".format(total_seconds_off))
+        self.logger.debug("Total seconds off: %.1f", total_seconds_off)
 
         # Set static on time
         repeat_seconds_on = self.options_channels['minimum_sec_on_per_min'][0]
         # Calculate off time based on duty cycle
         repeat_seconds_off = total_seconds_off / (total_dispense_seconds / repeat_seconds_on)
-        self.logger.debug("Repeat for {rep:.2f} seconds: on {on:.1f} seconds, off {off:.1f} seconds".format(
-            rep=repeat_seconds_off, on=repeat_seconds_on, off=repeat_seconds_off))
+        self.logger.debug(
+            "Repeat for %.2f seconds: on %.1f seconds, off %.1f seconds",
+            repeat_seconds_off, repeat_seconds_on, repeat_seconds_off)
 
         self.currently_dispensing = True
-        timer_dispense = time.time() + total_dispense_seconds
+        start_time = time.time()
+        timer_dispense = start_time + total_dispense_seconds
         timestamp_start = datetime.datetime.utcnow()
+        seconds_on = 0
 
         while time.time() < timer_dispense and self.currently_dispensing:
             # On for duration
@@ -235,6 +245,8 @@ class OutputModule(AbstractOutput):
             self.GPIO.output(self.options_channels['pin'][0], self.options_channels['on_state'][0])
             while time.time() < timer_dispense_on and self.currently_dispensing:
                 time.sleep(0.01)
+            # Count the time actually spent on, which is shorter if interrupted
+            seconds_on += repeat_seconds_on - (timer_dispense_on - time.time())
 
             # Off for duration
             timer_dispense_off = time.time() + repeat_seconds_off
@@ -243,9 +255,38 @@ class OutputModule(AbstractOutput):
             while time.time() < timer_dispense_off and self.currently_dispensing:
                 time.sleep(0.01)
 
+        if not self.currently_dispensing:
+            # Interrupted by an override or an off command, record what was actually delivered
+            total_seconds_on = seconds_on
+            total_dispense_seconds = time.time() - start_time
+            amount = self.dispensed_volume(seconds_on)
         self.currently_dispensing = False
         self.record_dispersal(amount, total_seconds_on, total_dispense_seconds, timestamp=timestamp_start)
     
+    def dispensed_volume(self, seconds_on):
+        """Volume delivered while the pump was on for the given seconds, at the fastest flow rate."""
+        return self.options_channels['fastest_dispense_rate_ml_min'][0] / 60 * seconds_on
+
+    def start_dispense(self, target, *args):
+        """Run a dispense on the pump's worker thread, replacing any dispense in progress."""
+        self.cancel_dispense()
+        self.dispense_future = self.dispense_executor.submit(target, *args)
+        self.dispense_future.add_done_callback(self.log_dispense_error)
+
+    def log_dispense_error(self, future):
+        """Log an exception raised by a dispense, which the worker thread would otherwise drop."""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            self.logger.error("Dispense error: {}".format(error), exc_info=error)
+
+    def cancel_dispense(self):
+        """Drop a queued dispense and signal a running one to stop."""
+        if self.dispense_future is not None:
+            self.dispense_future.cancel()
+        self.currently_dispensing = False
+
     def record_dispersal(self, amount, total_on_seconds, total_dispense_seconds, timestamp=None):
         measure_dict = copy.deepcopy(measurements_dict)
         measure_dict[0]['value'] = total_on_seconds
@@ -258,16 +299,14 @@ class OutputModule(AbstractOutput):
         add_measurements_influxdb(self.unique_id, measure_dict, use_same_timestamp=False)
 
     def output_switch(self, state, output_type=None, amount=None, output_channel=None):
-        self.logger.debug("state: {}, output_type: {}, amount: {}".format(
-            state, output_type, amount))
+        self.logger.debug("state: %s, output_type: %s, amount: %s", state, output_type, amount)
 
         if amount is not None and amount < 0:
             self.logger.error("Amount cannot be less than 0")
             return
 
         if state == 'off':
-            if self.currently_dispensing:
-                self.currently_dispensing = False
+            self.cancel_dispense()
             self.logger.debug("Output turned off")
             self.GPIO.output(self.options_channels['pin'][0], not self.options_channels['on_state'][0])
 
@@ -278,17 +317,11 @@ class OutputModule(AbstractOutput):
 
             if self.options_channels['flow_mode'][0] == 'fastest_flow_rate':
                 total_dispense_seconds = amount / self.options_channels['fastest_dispense_rate_ml_min'][0] * 60
-                msg = "Turning pump on for {sec:.1f} seconds to dispense {ml:.1f} ml (at {rate:.1f} ml/min, " \
-                      "the fastest flow rate).".format(
-                        sec=total_dispense_seconds,
-                        ml=amount,
-                        rate=self.options_channels['fastest_dispense_rate_ml_min'][0])
-                self.logger.debug(msg)
-
-                write_db = threading.Thread(
-                    target=self.dispense_volume_fastest,
-                    args=(amount, total_dispense_seconds,))
-                write_db.start()
+                self.logger.debug(
+                    "Turning pump on for %.1f seconds to dispense %.1f ml (at %.1f ml/min, the fastest flow rate).",
+                    total_dispense_seconds, amount, self.options_channels['fastest_dispense_rate_ml_min'][0])
+
+                self.start_dispense(self.dispense_volume_fastest, amount, total_dispense_seconds)
                 return
 
             elif self.options_channels['flow_mode'][0] == 'specify_flow_rate':
@@ -296,27 +329,21 @@ class OutputModule(AbstractOutput):
                                        60 * self.options_channels['minimum_sec_on_per_min'][0])
                 if self.options_channels['flow_rate'][0] < slowest_rate_ml_min:
                     self.logger.debug(
-                        "Instructed to dispense {ir:.1f} ml/min, "
-                        "however the slowest rate is set to {sr:.1f} ml/min.".format(
-                            ir=self.options_channels['flow_rate'][0], sr=slowest_rate_ml_min))
+                        "Instructed to dispense %.1f ml/min, however the slowest rate is set to %.1f ml/min.",
+                        self.options_channels['flow_rate'][0], slowest_rate_ml_min)
                     dispense_rate = slowest_rate_ml_min
                 elif self.options_channels['flow_rate'][0] > self.options_channels['fastest_dispense_rate_ml_min'][0]:
                     self.logger.debug(
-                        "Instructed to dispense {ir:.1f} ml/min, "
-                        "however the fastest rate is set to {fr:.1f} ml/min.".format(
-                            ir=self.options_channels['flow_rate'][0],
-                            fr=self.options_channels['fastest_dispense_rate_ml_min'][0]))
+                        "Instructed to dispense %.1f ml/min, however the fastest rate is set to %.1f ml/min.",
+                        self.options_channels['flow_rate'][0],
+                        self.options_channels['fastest_dispense_rate_ml_min'][0])
                     dispense_rate = self.options_channels['fastest_dispense_rate_ml_min'][0]
                 else:
                     dispense_rate = self.options_channels['flow_rate'][0]
 
-                self.logger.debug("Turning pump on to dispense {ml:.1f} ml at {rate:.1f} ml/min.".format(
-                    ml=amount, rate=dispense_rate))
+                self.logger.debug("Turning pump on to dispense %.1f ml at %.1f ml/min.", amount, dispense_rate)
 
-                write_db = threading.Thread(
-                    target=self.dispense_volume_rate,
-                    args=(amount, dispense_rate,))
-                write_db.start()
+                self.start_dispense(self.dispense_volume_rate, amount, dispense_rate)
                 return
 
             else:
@@ -353,3 +380,9 @@ class OutputModule(AbstractOutput):
 
     def is_setup(self):
         return self.output_setup
+
+    def stop_output(self):
+        """Stop any dispense and the worker thread when the Output is stopped."""
+        self.cancel_dispense()
+        self.dispense_executor.shutdown(wait=False)
+        super().stop_output()